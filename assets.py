@@ -0,0 +1,147 @@
+"""Startup asset loading for the scoreboard.
+
+Decoding and rescaling the PNGs and scanning system fonts dominate the
+time to first frame on a Pi booting from SD card, so:
+
+- images are decoded and scaled once, then stored as raw pixels in
+  CACHE_DIR, keyed by the source file's hash and the target size;
+- resolved font files are remembered in CACHE_DIR/fonts.json and each
+  Font object is only built once per process;
+- sounds and music load on a background thread so the first frame does
+  not wait for the mixer.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import pygame
+import pygame.sysfont
+
+CACHE_DIR = os.path.join("assets", ".cache")
+FONT_INDEX = os.path.join(CACHE_DIR, "fonts.json")
+
+
+def _write_atomic(path, data, mode="wb"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, mode) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# --- IMAGES ---
+def load_image(path, size, alpha=False):
+    """Load `path` scaled to `size` and converted for the display.
+
+    Needs pygame.display.set_mode() to have been called already.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    fmt = "RGBA" if alpha else "RGB"
+    name = os.path.splitext(os.path.basename(path))[0]
+    cached = os.path.join(CACHE_DIR, f"{name}-{digest}-{size[0]}x{size[1]}.{fmt.lower()}")
+
+    try:
+        with open(cached, "rb") as f:
+            image = pygame.image.frombytes(f.read(), size, fmt)
+        return image.convert_alpha() if alpha else image.convert()
+    except (OSError, ValueError):
+        pass
+
+    image = pygame.image.load(path)
+    image = image.convert_alpha() if alpha else image.convert()
+    image = pygame.transform.scale(image, size)
+    try:
+        _write_atomic(cached, pygame.image.tobytes(image, fmt))
+    except OSError as e:
+        print("⚠️ Could not cache image:", e)
+    return image
+
+
+# --- FONTS ---
+_fonts = {}
+_font_index = None
+
+
+def _load_font_index():
+    global _font_index
+    if _font_index is None:
+        try:
+            with open(FONT_INDEX) as f:
+                _font_index = json.load(f)
+        except (OSError, ValueError):
+            _font_index = {}
+    return _font_index
+
+
+def font(name, size, bold=False, italic=False):
+    """Cached equivalent of pygame.font.SysFont(name, size, bold, italic)."""
+    key = (name, size, bold, italic)
+    if key in _fonts:
+        return _fonts[key]
+
+    index = _load_font_index()
+    entry = index.get(f"{name}|{bold}|{italic}")
+    if entry is None or (entry["path"] and not os.path.exists(entry["path"])):
+        # Let SysFont do the (slow) system scan, and record what it picked
+        resolved = {}
+
+        def record(path, size, bold, italic):
+            resolved.update(path=path, bold=bold, italic=italic)
+            return pygame.sysfont.font_constructor(path, size, bold, italic)
+
+        _fonts[key] = pygame.sysfont.SysFont(name, size, bold, italic, constructor=record)
+        index[f"{name}|{bold}|{italic}"] = resolved
+        try:
+            _write_atomic(FONT_INDEX, json.dumps(index, indent=1), "w")
+        except OSError as e:
+            print("⚠️ Could not cache font index:", e)
+    else:
+        _fonts[key] = pygame.sysfont.font_constructor(entry["path"], size, entry["bold"], entry["italic"])
+    return _fonts[key]
+
+
+# --- SOUND ---
+class SoundBank:
+    """Loads sound effects (and starts music) on a background thread.
+
+    play() silently skips sounds that are not loaded yet or failed to load.
+    `ready` is set once loading has finished either way; `available` only
+    becomes True if the mixer actually started.
+    """
+
+    def __init__(self, sounds, music=None, music_volume=0.4):
+        self.sounds = {}
+        self.available = False
+        self.ready = threading.Event()
+        self._thread = threading.Thread(target=self._load, args=(sounds, music, music_volume),
+                                        name="sound-loader", daemon=True)
+        self._thread.start()
+
+    def _load(self, sounds, music, music_volume):
+        try:
+            pygame.mixer.init()
+            self.available = True
+            for name, path in sounds.items():
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(path)
+                except Exception as e:
+                    print(f"⚠️ Sound '{name}' missing or mixer error:", e)
+            if music:
+                try:
+                    pygame.mixer.music.load(music)
+                    pygame.mixer.music.set_volume(music_volume)
+                    pygame.mixer.music.play(-1)  # -1 = infinite loop
+                    print("🎵 Background hockey music playing.")
+                except Exception as e:
+                    print("⚠️ Could not load background music:", e)
+        except Exception as e:
+            print("⚠️ Mixer unavailable:", e)
+        finally:
+            self.ready.set()
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound:
+            sound.play()
@@ -0,0 +1,127 @@
+"""End-to-end latency and bandwidth of the state broadcast.
+
+Plays a simulated game at 60 fps (rules engine fed with switch hits) and
+publishes every frame over local multicast to many subscribers, all read
+by one selector thread. Reports publish-to-apply latency, bytes per second
+of play, and whether every subscriber ended on the publisher's state.
+--loss drops that fraction of datagrams to exercise snapshot recovery.
+
+    python benchmarks/bench_broadcast.py [--subscribers 50] [--seconds 5] [--loss 0.05]
+"""
+import argparse
+import os
+import random
+import selectors
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from broadcast import StatePublisher, StateSubscriber, HEADER, GROUP  # noqa: E402
+from rules import Game, TARGET, BUMPER1, BUMPER2, LETTER, DRAIN, RESET  # noqa: E402
+
+
+class LossySocket:
+    def __init__(self, sock, loss, rng):
+        self.sock, self.loss, self.rng = sock, loss, rng
+
+    def sendto(self, data, address):
+        if self.rng.random() >= self.loss:
+            self.sock.sendto(data, address)
+
+    def close(self):
+        self.sock.close()
+
+
+def publish(publisher, game, sent_at):
+    """Publish and remember when the datagram (if any) went out."""
+    seq = publisher.seq
+    sent_at[seq] = time.perf_counter()
+    publisher.publish(game.state)
+    if publisher.seq == seq:  # nothing changed, nothing sent
+        del sent_at[seq]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--hit-rate", type=float, default=30, help="switch hits per second")
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    subscribers = [StateSubscriber(GROUP, args.port) for _ in range(args.subscribers)]
+    publisher = StatePublisher(GROUP, args.port)
+    publisher.sock = LossySocket(publisher.sock, args.loss, random.Random(2))
+
+    sent_at = {}
+    latencies = []
+    stop = threading.Event()
+
+    def receive():
+        selector = selectors.DefaultSelector()
+        for sub in subscribers:
+            selector.register(sub, selectors.EVENT_READ)
+        while not stop.is_set():
+            for key, _ in selector.select(timeout=0.05):
+                sub = key.fileobj
+                while True:
+                    try:
+                        data = sub.sock.recv(64)
+                    except BlockingIOError:
+                        break
+                    now = time.perf_counter()
+                    sub.handle(data)
+                    seq = HEADER.unpack_from(data)[3]
+                    if seq in sent_at:
+                        latencies.append(now - sent_at[seq])
+
+    receiver = threading.Thread(target=receive)
+    receiver.start()
+
+    game = Game()
+    kinds = [TARGET, BUMPER1, BUMPER2] * 40 + [LETTER, DRAIN, RESET]
+    start = time.perf_counter()
+    next_frame = start
+    while time.perf_counter() - start < args.seconds:
+        now = time.perf_counter()
+        events = []
+        while rng.random() < args.hit_rate / 60:
+            events.append((rng.choice(kinds), now + rng.random() / 1000))
+            if len(events) > 5:
+                break
+        game.apply(events)
+        publish(publisher, game, sent_at)
+        next_frame += 1 / 60
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+
+    time.sleep(publisher.snapshot_interval + 0.1)  # let a final snapshot resync everyone
+    publish(publisher, game, sent_at)
+    time.sleep(0.2)
+    stop.set()
+    receiver.join()
+
+    in_sync = sum(sub.state == game.state for sub in subscribers)
+    print(f"{args.subscribers} subscribers, {elapsed:.1f}s of play, final {game.state}")
+    print(f"messages: {publisher.messages} ({publisher.messages / elapsed:.1f}/s), "
+          f"{publisher.bytes / elapsed:.0f} bytes/s per subscriber, "
+          f"{publisher.bytes / max(1, publisher.messages):.1f} bytes/message")
+    print("latency ms: p50 %.3f  p95 %.3f  p99 %.3f  max %.3f" % tuple(
+        percentile(latencies, p) * 1000 for p in (50, 95, 99, 100)))
+    print(f"gaps recovered: {sum(sub.gaps for sub in subscribers)}, "
+          f"in sync at end: {in_sync}/{len(subscribers)}")
+    publisher.close()
+    for sub in subscribers:
+        sub.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Hammer the coil driver with bumper fires and report threads and jitter.
+
+Several threads call fire() on two mock coils at a sustained rate while a
+60 fps stand-in frame loop runs alongside, so the driver's timing is
+measured under the same GIL contention as on the cabinet. Reports the
+driver's jitter and the frame loop's frame times, with and without the
+driver running.
+
+    python benchmarks/bench_coils.py [--rate 200] [--seconds 5]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from coils import CoilDriver  # noqa: E402
+
+
+class RecordingGate:
+    """Mock gate that checks on/off always alternate."""
+
+    def __init__(self):
+        self.state = False
+        self.errors = 0
+
+    def on(self):
+        self.errors += self.state
+        self.state = True
+
+    def off(self):
+        self.state = False
+
+    def close(self): pass
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def frame_loop(stop, times):
+    """60 fps loop doing a few ms of pure-Python work per frame."""
+    next_frame = time.perf_counter()
+    while time.monotonic() < stop:
+        start = time.perf_counter()
+        sum(i * i for i in range(20000))  # stand-in for rules and drawing
+        times.append(time.perf_counter() - start)
+        next_frame += 1 / 60
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200, help="fire() calls/s per caller")
+    parser.add_argument("--callers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    idle_frames = []
+    frame_loop(time.monotonic() + min(args.seconds, 2), idle_frames)
+
+    gates = {1: RecordingGate(), 2: RecordingGate()}
+    driver = CoilDriver()
+    for name, gate in gates.items():
+        driver.add(name, gate, pulse=0.02)
+
+    baseline = threading.active_count()
+    peak = [baseline]
+    stop = time.monotonic() + args.seconds
+
+    def caller(i):
+        n = 0
+        start = time.monotonic()
+        while time.monotonic() < stop:
+            driver.fire(1 + (n + i) % 2)
+            peak[0] = max(peak[0], threading.active_count())
+            n += 1
+            time.sleep(max(0.0, start + n / args.rate - time.monotonic()))
+
+    frames = []
+    callers = [threading.Thread(target=caller, args=(i,)) for i in range(args.callers)]
+    callers.append(threading.Thread(target=frame_loop, args=(stop, frames)))
+    for t in callers:
+        t.start()
+    for t in callers:
+        t.join()
+    time.sleep(0.1)
+    stats = driver.stats()
+    driver.close()
+
+    print(f"{args.callers} callers x {args.rate:g} fires/s for {args.seconds:g}s")
+    print(f"threads: before {baseline}, peak {peak[0]} (includes {args.callers} callers "
+          f"and the frame loop)")
+    print(f"double-on errors: {sum(g.errors for g in gates.values())}")
+    for key, value in stats.items():
+        print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
+    for name, times in (("frame loop alone", idle_frames), ("with coil load", frames)):
+        print(f"{name:>16}: frame ms p50 {percentile(times, 50) * 1000:.3f}  "
+              f"p99 {percentile(times, 99) * 1000:.3f}  max {max(times) * 1000:.3f}")
+
+
+if __name__ == "__main__":
+    main()
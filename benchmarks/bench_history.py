@@ -0,0 +1,93 @@
+"""Frame-time impact of recording games, and leaderboard query speed.
+
+Runs a 60 fps stand-in frame loop (rules plus some busy work) twice: once
+with no recording and once while every frame feeds switch hits into a
+GameRecorder and games finish every few frames. Reports the frame-time
+percentiles of both runs, then times top-N and per-session queries over
+the history that was written.
+
+    python benchmarks/bench_history.py [--seconds 5] [--hits-per-frame 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import history  # noqa: E402
+from rules import Game, TARGET, BUMPER1, BUMPER2, DRAIN, RESET  # noqa: E402
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run(seconds, hits_per_frame, frames_per_game, recorder):
+    rng = random.Random(1)
+    game = Game()
+    frame = 1 / 60
+    times = []
+    t = 0.0
+    n = 0
+    next_frame = time.perf_counter()
+    end = next_frame + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        events = []
+        for _ in range(hits_per_frame):
+            t += rng.uniform(0.001, 0.01)
+            events.append((rng.choice((TARGET, BUMPER1, BUMPER2)), t))
+        n += 1
+        if n % frames_per_game == 0:
+            events += [(DRAIN, t), (DRAIN, t), (RESET, t)]
+        for event in events:
+            game.apply((event,))
+            if recorder:
+                recorder.record(event, game.state)
+        sum(i * i for i in range(3000))  # stand-in for drawing
+        times.append(time.perf_counter() - start)
+        next_frame += frame
+        time.sleep(max(0.0, next_frame - time.perf_counter()))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--hits-per-frame", type=int, default=5)
+    parser.add_argument("--frames-per-game", type=int, default=6)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="pinball-history-")
+    try:
+        base = run(args.seconds, args.hits_per_frame, args.frames_per_game, None)
+        store = history.HistoryStore(directory, fsync_interval=1.0)
+        recorded = run(args.seconds, args.hits_per_frame, args.frames_per_game,
+                       history.GameRecorder(store))
+        store.close()
+
+        for name, times in (("no recording", base), ("recording", recorded)):
+            print(f"{name:>13}: frame ms p50 {percentile(times, 50) * 1000:.3f}  "
+                  f"p99 {percentile(times, 99) * 1000:.3f}  max {max(times) * 1000:.3f}")
+        print(f"games written: {store.games_written}, fsyncs: {store.fsyncs}, "
+              f"log size: {os.path.getsize(os.path.join(directory, history.LOG_NAME)) // 1024} KiB")
+
+        reader = history.HistoryReader(directory)
+        start = time.perf_counter()
+        top = reader.top(10)
+        mid = time.perf_counter()
+        sessions = reader.sessions()
+        done = time.perf_counter()
+        print(f"top-10 of {len(reader)} games: {(mid - start) * 1000:.2f} ms (best {top[0]['score']}), "
+              f"{len(sessions)} session aggregates: {(done - mid) * 1000:.2f} ms")
+        reader.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
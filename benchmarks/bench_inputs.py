@@ -0,0 +1,58 @@
+"""Measure switch-to-frame latency and dropped hits with simulated buttons.
+
+Runs a 60 fps frame loop that drains the input queue while simulated
+switches fire in bursts, then reports how long closures waited before a
+frame picked them up and how many were lost.
+
+    python benchmarks/bench_inputs.py [--rate 50] [--seconds 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from inputs import InputQueue, SimulatedButton, TARGET, BUMPER1, BUMPER2  # noqa: E402
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=50, help="hits/s per switch")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--fps", type=float, default=60)
+    args = parser.parse_args()
+
+    queue = InputQueue()
+    buttons = {TARGET: SimulatedButton(), BUMPER1: SimulatedButton(), BUMPER2: SimulatedButton()}
+    for source, button in buttons.items():
+        queue.attach(button, source)
+
+    count = int(args.rate * args.seconds)
+    threads = [b.burst(args.rate, count) for b in buttons.values()]
+
+    latencies = []
+    handled = 0
+    frame = 1 / args.fps
+    next_frame = time.monotonic()
+    while any(t.is_alive() for t in threads) or len(queue):
+        now = time.monotonic()
+        for hit in queue.drain():
+            latencies.append(now - hit.t)
+            handled += 1
+        next_frame += frame
+        time.sleep(max(0.0, next_frame - time.monotonic()))
+
+    pressed = sum(b.presses for b in buttons.values())
+    print(f"switches: {len(buttons)} x {args.rate:g} hits/s for {args.seconds:g}s @ {args.fps:g} fps")
+    print(f"pressed {pressed}, handled {handled}, dropped {queue.dropped}, lost {pressed - handled - queue.dropped}")
+    print("latency ms: p50 %.2f  p95 %.2f  p99 %.2f  max %.2f" % tuple(
+        percentile(latencies, p) * 1000 for p in (50, 95, 99, 100)))
+
+
+if __name__ == "__main__":
+    main()
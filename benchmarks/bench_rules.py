@@ -0,0 +1,61 @@
+"""Replay throughput of the headless rules engine.
+
+Generates a synthetic game log (switch hits at arcade rates plus the odd
+letter, drain and reset), replays it twice to check the result is
+deterministic, and reports events per second.
+
+    python benchmarks/bench_rules.py [--events 2000000] [--log game.jsonl]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import rules  # noqa: E402
+from rules import TARGET, BUMPER1, BUMPER2, BONUS, SPOT, LETTER, DRAIN, RESET  # noqa: E402
+
+KINDS = [TARGET, BUMPER1, BUMPER2, BONUS, SPOT, LETTER, DRAIN, RESET]
+WEIGHTS = [30, 30, 30, 2, 2, 4, 1, 0.1]
+
+
+def synthetic_log(count, seed=1):
+    rng = random.Random(seed)
+    kinds = rng.choices(KINDS, WEIGHTS, k=count)
+    t = 0.0
+    events = []
+    for kind in kinds:
+        t += rng.expovariate(50)  # ~50 events/s
+        events.append((kind, round(t, 4)))
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--log", help="replay this JSONL log instead of a synthetic one")
+    parser.add_argument("--batch", type=int, default=4096, help="events per apply() call")
+    args = parser.parse_args()
+
+    assert "pygame" not in sys.modules, "importing rules pulled in pygame"
+    events = rules.load_log(args.log) if args.log else synthetic_log(args.events)
+
+    start = time.perf_counter()
+    whole = rules.replay(events)
+    elapsed = time.perf_counter() - start
+
+    game = rules.Game()
+    start = time.perf_counter()
+    for i in range(0, len(events), args.batch):
+        game.apply(events[i:i + args.batch])
+    batched = time.perf_counter() - start
+
+    print(f"{len(events)} events -> {whole}")
+    print(f"single replay: {len(events) / elapsed / 1e6:.2f} M events/s")
+    print(f"batches of {args.batch}: {len(events) / batched / 1e6:.2f} M events/s")
+    print("deterministic:", game.state == whole == rules.replay(events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Cold- and warm-start time to first frame.
+
+Launches scoreboard.py under SDL's dummy video and audio drivers, waits for
+its "First frame" message and stops it. Cold runs delete the asset cache
+first; warm runs reuse what the previous run wrote.
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CACHE_DIR = os.path.join(ROOT, "assets", ".cache")
+
+
+def time_to_first_frame():
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-u", "scoreboard.py"], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in proc.stdout:
+            if "First frame" in line:
+                return time.perf_counter() - start
+        raise RuntimeError("scoreboard.py exited before drawing a frame")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode in ("cold", "warm"):
+        times = []
+        for _ in range(args.runs):
+            if mode == "cold":
+                shutil.rmtree(CACHE_DIR, ignore_errors=True)
+            times.append(time_to_first_frame())
+        times.sort()
+        print(f"{mode}: median {times[len(times) // 2] * 1000:.0f} ms, "
+              f"best {times[0] * 1000:.0f} ms, worst {times[-1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Mirror the scoreboard state to other screens over UDP multicast.
+
+The game loop calls StatePublisher.publish(state) once per frame. Only
+fields that changed since the last message are sent, as a small binary
+datagram with a sequence number; a full snapshot goes out every
+SNAPSHOT_INTERVAL seconds so late joiners and subscribers that missed a
+packet resynchronise. Sends never block: if the socket would block, the
+network is down or a value does not fit the wire format, the message is
+dropped and counted.
+
+Wire format (little endian):
+    header   "PB" | kind u8 | fields u8 | seq u32
+    snapshot score i64 | balls_left i32 | collected u8 | mega_jackpot u8
+    delta    only the fields whose bit is set, in this order:
+             score change i32 | balls_left i32 | collected u8 | mega_jackpot u8
+
+Run this module to open a mirror display (or, with --png, to keep a PNG
+of the dot-matrix view up to date for a stream overlay):
+
+    python broadcast.py [--group 239.255.42.99] [--port 5005] [--png overlay.png]
+"""
+import argparse
+import os
+import socket
+import struct
+import time
+
+from rules import GameState
+
+GROUP = "239.255.42.99"
+PORT = 5005
+SNAPSHOT_INTERVAL = 1.0  # seconds
+
+MAGIC = b"PB"
+SNAPSHOT, DELTA = 0, 1
+SCORE, BALLS, COLLECTED, JACKPOT = 1, 2, 4, 8
+HEADER = struct.Struct("<2sBBI")
+FULL = struct.Struct("<qiBB")
+FIELDS = ((SCORE, struct.Struct("<i")), (BALLS, struct.Struct("<i")),
+          (COLLECTED, struct.Struct("<B")), (JACKPOT, struct.Struct("<B")))
+SEQ_MASK = 0xFFFFFFFF
+
+
+def encode(seq, state, last=None):
+    """Datagram for `state`: a delta against `last`, or a snapshot if None.
+
+    Returns None if nothing changed.
+    """
+    score, balls_left, collected, jackpot = state
+    if last is not None:
+        change = score - last[0]
+        values = (change, balls_left, collected, jackpot)
+        fields, body = 0, b""
+        if -2**31 <= change < 2**31:
+            for (bit, fmt), value, old in zip(FIELDS, values, (0,) + tuple(last[1:])):
+                if value != old:
+                    fields |= bit
+                    body += fmt.pack(value)
+            if not fields:
+                return None
+            return HEADER.pack(MAGIC, DELTA, fields, seq) + body
+    return (HEADER.pack(MAGIC, SNAPSHOT, SCORE | BALLS | COLLECTED | JACKPOT, seq)
+            + FULL.pack(score, balls_left, collected, jackpot))
+
+
+class StatePublisher:
+    """Sends score, balls, PIONEER progress and jackpot changes."""
+
+    def __init__(self, group=GROUP, port=PORT, snapshot_interval=SNAPSHOT_INTERVAL, ttl=1):
+        self.address = (group, port)
+        self.snapshot_interval = snapshot_interval
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        self.sock.setblocking(False)
+        self.seq = 0
+        self.last = None            # state as of the last message sent
+        self.last_snapshot = float("-inf")
+        self.messages = self.bytes = self.dropped = 0
+
+    def publish(self, state, now=None):
+        """Send whatever changed in `state` (a GameState); call once per frame."""
+        now = time.monotonic() if now is None else now
+        current = state.as_tuple()
+        snapshot = now - self.last_snapshot >= self.snapshot_interval
+        try:
+            message = encode(self.seq, current, None if snapshot else self.last)
+        except (struct.error, OverflowError):  # out of range for the wire format
+            self.dropped += 1
+            return
+        if snapshot:
+            self.last_snapshot = now
+        if message is None:
+            return
+        self.seq = (self.seq + 1) & SEQ_MASK
+        self.last = current
+        try:
+            self.sock.sendto(message, self.address)
+            self.messages += 1
+            self.bytes += len(message)
+        except OSError:  # would block, or no route to the group
+            self.dropped += 1
+
+    def close(self):
+        self.sock.close()
+
+
+class StateSubscriber:
+    """Rebuilds the published GameState from snapshots and deltas."""
+
+    def __init__(self, group=GROUP, port=PORT):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.sock.bind(("", port))
+        membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0"))
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.setblocking(False)
+        self.state = None   # None until the first snapshot arrives
+        self.seq = None
+        self.received = self.gaps = 0
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def poll(self):
+        """Apply every datagram waiting on the socket; True if state changed."""
+        changed = False
+        while True:
+            try:
+                data = self.sock.recv(64)
+            except BlockingIOError:
+                return changed
+            changed |= self.handle(data)
+
+    def handle(self, data):
+        """Apply one datagram; returns True if the state changed."""
+        if len(data) < HEADER.size:
+            return False
+        magic, kind, fields, seq = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            return False
+        self.received += 1
+
+        if kind == SNAPSHOT:
+            score, balls_left, collected, jackpot = FULL.unpack_from(data, HEADER.size)
+            new = GameState(score, balls_left, collected, bool(jackpot))
+        elif self.state is not None and seq == (self.seq + 1) & SEQ_MASK:
+            new = GameState(*self.state.as_tuple())
+            offset = HEADER.size
+            for bit, fmt in FIELDS:
+                if fields & bit:
+                    value, = fmt.unpack_from(data, offset)
+                    offset += fmt.size
+                    if bit == SCORE:
+                        new.score += value
+                    elif bit == BALLS:
+                        new.balls_left = value
+                    elif bit == COLLECTED:
+                        new.collected = value
+                    else:
+                        new.mega_jackpot = bool(value)
+        else:
+            # Missed something: ignore deltas until the next snapshot
+            if self.state is not None:
+                self.gaps += 1
+                self.state = None
+            return False
+
+        self.seq = seq
+        changed = new != self.state
+        self.state = new
+        return changed
+
+    def close(self):
+        self.sock.close()
+
+
+# --- MIRROR DISPLAY ---
+def draw_mirror(surface, dot_matrix, font, state):
+    """The scoreboard's dot-matrix panel: score, PIONEER bulbs, balls, jackpot."""
+    surface.fill((20, 20, 20))
+    width = surface.get_width()
+    if state is None:
+        waiting = font.render("Waiting for scoreboard...", True, (120, 120, 120))
+        surface.blit(waiting, (width // 2 - waiting.get_width() // 2, 20))
+        return
+    score = dot_matrix.render(str(state.score), (255, 255, 255), scale=3)
+    surface.blit(score, (width // 2 - score.get_width() // 2, 10))
+    bulbs = dot_matrix.render_bulbs("PIONEER", state.collected)
+    surface.blit(bulbs, (width // 2 - bulbs.get_width() // 2, 130))
+    surface.blit(font.render(f"Balls: {state.balls_left}", True, (255, 255, 255)), (20, 220))
+    if state.mega_jackpot:
+        mj = font.render("MEGA JACKPOT!!", True, (206, 17, 65))
+        surface.blit(mj, (width - mj.get_width() - 20, 220))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror the pinball scoreboard.")
+    parser.add_argument("--group", default=GROUP)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--png", help="headless: keep this PNG updated instead of opening a window")
+    args = parser.parse_args()
+
+    if args.png:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import assets
+    from dotmatrix import DotMatrix
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((640, 270))
+    pygame.display.set_caption("SHU PIONEER ARENA (mirror)")
+    dot_matrix = DotMatrix(assets.font("Courier New", 48, bold=True))
+    font = assets.font("Courier New", 28, bold=True)
+    subscriber = StateSubscriber(args.group, args.port)
+
+    draw_mirror(screen, dot_matrix, font, None)
+    pygame.display.flip()
+    running = True
+    while running:
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                running = False
+        if subscriber.poll():
+            draw_mirror(screen, dot_matrix, font, subscriber.state)
+            pygame.display.flip()
+            if args.png:
+                pygame.image.save(screen, args.png + ".tmp.png")
+                os.replace(args.png + ".tmp.png", args.png)
+        pygame.time.wait(15)
+    subscriber.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Single-thread pulse scheduler for the solenoid coils.
+
+Every gate on()/off() happens on one long-lived driver thread, driven by a
+timer heap, so a fast bumper volley can't pile up threads or race two
+pulses on the same gate. Each coil has a maximum on-time, a minimum
+recharge gap between pulses and a duty-cycle cap over a sliding window.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+PULSE_TIME = 0.1      # default pulse length (s)
+MAX_ON_TIME = 0.15    # a pulse is never longer than this (s)
+RECHARGE_TIME = 0.05  # minimum off-time between pulses (s)
+DUTY_CYCLE = 0.5      # max fraction of DUTY_WINDOW a coil may be on
+DUTY_WINDOW = 2.0     # seconds
+SPIN_TIME = 0.002     # poll (yielding the GIL) this close to a deadline
+
+
+class Coil:
+    def __init__(self, gate, pulse, max_on, recharge, duty):
+        self.gate = gate
+        self.pulse = min(pulse, max_on)
+        self.max_on = max_on
+        self.recharge = recharge
+        self.duty = duty
+        self.busy = False        # on, or a pulse already scheduled
+        self.ready_at = float("-inf")
+        self.history = deque()   # (start, length) of recent pulses
+
+    def on_time(self, now):
+        """Seconds this coil has been on within the last DUTY_WINDOW."""
+        while self.history and self.history[0][0] + self.history[0][1] < now - DUTY_WINDOW:
+            self.history.popleft()
+        return sum(length for _, length in self.history)
+
+
+class CoilDriver:
+    """Schedules coil pulses on a single background thread."""
+
+    def __init__(self):
+        self.coils = {}
+        self._timers = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = True
+        self.issued = 0
+        self.coalesced = 0
+        self.throttled = 0
+        self.jitter = deque(maxlen=1000)  # recent (actual - scheduled) times
+        self._thread = threading.Thread(target=self._run, name="coil-driver", daemon=True)
+        self._thread.start()
+
+    def add(self, name, gate, pulse=PULSE_TIME, max_on=MAX_ON_TIME,
+            recharge=RECHARGE_TIME, duty=DUTY_CYCLE):
+        self.coils[name] = Coil(gate, pulse, max_on, recharge, duty)
+
+    def fire(self, name):
+        """Request a pulse on coil `name`; returns False if merged or refused."""
+        now = time.monotonic()
+        with self._cond:
+            coil = self.coils[name]
+            if coil.busy:
+                self.coalesced += 1
+                return False
+            if coil.on_time(now) + coil.pulse > coil.duty * DUTY_WINDOW:
+                self.throttled += 1
+                return False
+            coil.busy = True
+            self._schedule(max(now, coil.ready_at), "on", coil)
+            return True
+
+    def _schedule(self, when, action, coil):
+        heapq.heappush(self._timers, (when, next(self._seq), action, coil))
+        self._cond.notify()
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                if not self._timers:
+                    self._cond.wait()
+                    continue
+                when = self._timers[0][0]
+                delay = when - time.monotonic()
+                if delay > SPIN_TIME:
+                    self._cond.wait(delay - SPIN_TIME)
+                    continue
+                if delay > 0:
+                    # Poll without the lock so fire() isn't blocked, but stop
+                    # as soon as it queues a timer due before this one
+                    self._cond.release()
+                    while time.monotonic() < when:
+                        time.sleep(0)  # yield the GIL to the frame loop
+                        with self._cond:
+                            if self._timers[0][0] < when:
+                                break
+                    self._cond.acquire()
+                    continue
+                when, _, action, coil = heapq.heappop(self._timers)
+                now = time.monotonic()
+                self.jitter.append(now - when)
+                if action == "on":
+                    coil.gate.on()
+                    coil.history.append((now, coil.pulse))
+                    self.issued += 1
+                    self._schedule(now + coil.pulse, "off", coil)
+                else:
+                    coil.gate.off()
+                    coil.ready_at = now + coil.recharge
+                    coil.busy = False
+
+    def stats(self):
+        """Pulse counts and scheduling jitter (ms) of recent timer events."""
+        with self._cond:
+            jitter = sorted(self.jitter)
+            stats = {"issued": self.issued, "coalesced": self.coalesced,
+                     "throttled": self.throttled}
+        if jitter:
+            stats["jitter_ms_mean"] = sum(jitter) / len(jitter) * 1000
+            stats["jitter_ms_p99"] = jitter[int(len(jitter) * 0.99)] * 1000
+            stats["jitter_ms_max"] = jitter[-1] * 1000
+        return stats
+
+    def close(self):
+        """Stop the driver thread and make sure every coil is off."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+        for coil in self.coils.values():
+            coil.gate.off()
@@ -0,0 +1,101 @@
+"""Dirty-rectangle compositor for the scoreboard screen.
+
+The static background is flattened once. Each widget keeps its last state,
+its rendered layer and the rect it covers; only widgets whose state changed
+are re-rendered, and only the screen regions they touched are restored
+from the background and re-composited.
+"""
+
+
+class Widget:
+    """One independently updated piece of the screen.
+
+    `state` is called every frame and returns something comparable; when it
+    changes, `render(state)` is called and must return `(layer, (x, y))`
+    or `(None, None)` if the widget currently shows nothing.
+    """
+
+    def __init__(self, name, state, render):
+        self.name = name
+        self.state = state
+        self.render = render
+        self.last_state = None
+        self.layer = None
+        self.rect = None
+        self.dirty = True
+
+    def refresh(self):
+        """Re-render if needed and return the rects that must be repainted."""
+        state = self.state()
+        if not self.dirty and state == self.last_state:
+            return []
+        old_rect = self.rect
+        self.layer, pos = self.render(state)
+        self.rect = self.layer.get_rect(topleft=pos) if self.layer else None
+        self.last_state = state
+        self.dirty = False
+        return [r for r in (old_rect, self.rect) if r]
+
+
+class Compositor:
+    """Composites widgets over a cached background, repainting only changes."""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.widgets = []
+        self.full_redraw = True
+        self.profiler = None  # optional FrameProfiler, marked once per widget
+
+    def add(self, name, state, render):
+        """Add a widget on top of the ones already added."""
+        widget = Widget(name, state, render)
+        self.widgets.append(widget)
+        self.full_redraw = True
+        return widget
+
+    def invalidate(self):
+        """Force every widget and the whole background to be repainted."""
+        for widget in self.widgets:
+            widget.dirty = True
+        self.full_redraw = True
+
+    def update(self):
+        """Repaint changed regions of the screen and return them."""
+        screen_rect = self.screen.get_rect()
+        regions = []
+        for widget in self.widgets:
+            regions += widget.refresh()
+            if self.profiler:
+                self.profiler.mark(widget.name)
+        if self.full_redraw:
+            regions = [screen_rect]
+            self.full_redraw = False
+        regions = merge_rects(r.clip(screen_rect) for r in regions)
+
+        for region in regions:
+            self.screen.blit(self.background, region.topleft, region)
+            for widget in self.widgets:
+                if widget.rect and widget.rect.colliderect(region):
+                    part = widget.rect.clip(region)
+                    self.screen.blit(widget.layer, part.topleft,
+                                     part.move(-widget.rect.x, -widget.rect.y))
+        return regions
+
+
+def merge_rects(rects):
+    """Union overlapping rects so no pixel is repainted twice."""
+    merged = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue
+        rect = rect.copy()
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
@@ -0,0 +1,126 @@
+"""Cached dot-matrix text renderer for the scoreboard.
+
+Each glyph is rasterised into its dot pattern once and kept in a small LRU
+atlas, so drawing a string is just a handful of blits per frame.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+FONT_NAME = "Courier New"
+FONT_SIZE = 48
+DOT_RADIUS = 2
+ATLAS_SIZE = 256  # max cached glyphs
+
+# PIONEER bulbs
+BULB_STEP = 70
+LIT_COLOR = (255, 215, 60)
+UNLIT_COLOR = (120, 120, 60)
+UNLIT_CHAR = "•"
+
+
+def dot_stamp(radius=DOT_RADIUS):
+    """Pixel offsets that pygame.draw.circle fills for a single dot."""
+    c = radius * 2
+    stamp = pygame.Surface((c * 2 + 1, c * 2 + 1))
+    pygame.draw.circle(stamp, (255, 255, 255), (c, c), radius)
+    xs, ys = np.nonzero(pygame.surfarray.array2d(stamp))
+    return xs - c, ys - c
+
+
+class DotMatrix:
+    """Draws text as a grid of round dots, caching each glyph's dot pattern."""
+
+    def __init__(self, font=None, radius=DOT_RADIUS, max_glyphs=ATLAS_SIZE):
+        self._font = font
+        self.max_glyphs = max_glyphs
+        self.stamp_x, self.stamp_y = dot_stamp(radius)
+        self.pad = int(max(np.abs(self.stamp_x).max(), np.abs(self.stamp_y).max()))
+        self.atlas = OrderedDict()
+        self.hits = self.misses = 0
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = pygame.font.SysFont(FONT_NAME, FONT_SIZE, bold=True)
+        return self._font
+
+    def text_width(self, text, scale=2):
+        """Width in pixels of the scaled text, before dotting."""
+        return self.font.size(text)[0] * scale
+
+    def glyph(self, char, scale, spacing, color, phase=0):
+        """Return the cached dot surface for one character (None if blank).
+
+        `phase` is the glyph's x offset within its string modulo `spacing`,
+        so the dot grid lines up with the one the whole string would use.
+        """
+        key = (char, scale, spacing, tuple(color), phase)
+        surf = self.atlas.get(key, False)
+        if surf is not False:
+            self.hits += 1
+            self.atlas.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self._build(char, scale, spacing, color, phase)
+        self.atlas[key] = surf
+        if len(self.atlas) > self.max_glyphs:
+            self.atlas.popitem(last=False)
+        return surf
+
+    def _build(self, char, scale, spacing, color, phase):
+        base = self.font.render(char, True, (255, 255, 255))
+        w, h = base.get_width() * scale, base.get_height() * scale
+        base = pygame.transform.scale(base, (w, h))
+        # Same threshold pygame.mask.from_surface uses (alpha > 127)
+        lit = pygame.surfarray.array_alpha(base) > 127
+        dots = np.zeros_like(lit)
+        first_x = -phase % spacing
+        dots[first_x::spacing, ::spacing] = lit[first_x::spacing, ::spacing]
+        cx, cy = np.nonzero(dots)
+        if not len(cx):
+            return None
+
+        p = self.pad
+        canvas = np.zeros((w + 2 * p, h + 2 * p), dtype=np.uint8)
+        for dx, dy in zip(self.stamp_x, self.stamp_y):
+            canvas[cx + dx + p, cy + dy + p] = 255
+
+        surf = pygame.Surface(canvas.shape, pygame.SRCALPHA)
+        surf.fill(color)
+        alpha = pygame.surfarray.pixels_alpha(surf)
+        alpha[...] = canvas
+        del alpha  # unlock the surface
+        return surf
+
+    def render(self, text, color=(255, 255, 255), scale=2, spacing=3):
+        """Return a transparent surface with `text` drawn at (pad, pad)."""
+        w, h = self.font.size(text)
+        surf = pygame.Surface((w * scale + 2 * self.pad, h * scale + 2 * self.pad),
+                              pygame.SRCALPHA)
+        self.draw(surf, text, self.pad, self.pad, color, scale, spacing)
+        return surf
+
+    def render_bulbs(self, word, lit, scale=2, step=BULB_STEP):
+        """Return a transparent surface with the first `lit` letters of
+        `word` lit and unlit bulbs for the rest, `step` pixels apart."""
+        width = max(self.text_width(c, scale) for c in word + UNLIT_CHAR)
+        surf = pygame.Surface(((len(word) - 1) * step + width + 2 * self.pad,
+                               self.font.get_height() * scale + 2 * self.pad), pygame.SRCALPHA)
+        for i, letter in enumerate(word):
+            if i < lit:
+                self.draw(surf, letter, self.pad + i * step, self.pad, LIT_COLOR, scale)
+            else:
+                self.draw(surf, UNLIT_CHAR, self.pad + i * step, self.pad, UNLIT_COLOR, scale)
+        return surf
+
+    def draw(self, surface, text, x, y, color=(255, 255, 255), scale=2, spacing=3):
+        """Draw `text` with its top-left corner at (x, y)."""
+        font = self.font
+        for i, char in enumerate(text):
+            # Where this glyph's bitmap lands inside the rendered string
+            offset = (font.size(text[:i + 1])[0] - font.size(char)[0]) * scale
+            glyph = self.glyph(char, scale, spacing, color, offset % spacing)
+            if glyph is not None:
+                surface.blit(glyph, (x + offset - self.pad, y - self.pad))
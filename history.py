@@ -0,0 +1,295 @@
+"""Persistent game history and high scores.
+
+Finished games are handed to HistoryStore.submit(), which never blocks:
+a background thread appends them to `games.jsonl` (one game per line,
+including its replayable event log) and a fixed-size binary index entry
+to `games.idx`, fsyncing at most every FSYNC_INTERVAL seconds.
+
+On startup the store trims any half-written tail left by a crash and
+re-indexes log lines the index missed. HistoryReader memory-maps the index
+so leaderboard and per-session queries never load the whole log.
+"""
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from inputs import TARGET, BUMPER1, BUMPER2
+from rules import RESET, replay
+
+HISTORY_DIR = "history"
+LOG_NAME = "games.jsonl"
+INDEX_NAME = "games.idx"
+FSYNC_INTERVAL = 5.0  # seconds
+HIT_KINDS = (TARGET, BUMPER1, BUMPER2)
+
+INDEX_DTYPE = np.dtype([
+    ("offset", "<u8"),   # byte offset of the game's line in the log
+    ("length", "<u4"),   # line length including the newline
+    ("session", "<u4"),  # scoreboard start time (unix seconds)
+    ("ended", "<f8"),    # unix time the game finished
+    ("score", "<i8"),
+    ("hits", "<u4"),     # strike plate + bumper closures
+    ("jackpot", "u1"),
+])
+
+
+def _index_entry(offset, length, game):
+    return np.array([(offset, length, game["session"], game["ended"], game["score"],
+                      game["hits"], game["jackpot"])], dtype=INDEX_DTYPE).tobytes()
+
+
+# --- RECOVERY ---
+def recover(directory=HISTORY_DIR):
+    """Repair the log and index after an unclean shutdown.
+
+    Returns a short description of what was fixed, or None.
+    """
+    os.makedirs(directory, exist_ok=True)
+    log_path = os.path.join(directory, LOG_NAME)
+    index_path = os.path.join(directory, INDEX_NAME)
+    fixes = []
+
+    with open(log_path, "ab+") as log:
+        size = log.seek(0, os.SEEK_END)
+        end = size
+        # Drop a trailing partial line (no newline yet)
+        while end:
+            start = max(0, end - 4096)
+            log.seek(start)
+            cut = log.read(end - start).rfind(b"\n")
+            if cut >= 0:
+                end = start + cut + 1
+                break
+            end = start
+        if end != size:
+            log.truncate(end)
+            fixes.append(f"trimmed {size - end} bytes from the log")
+        log_size = end
+
+    with open(index_path, "ab+") as index:
+        size = index.seek(0, os.SEEK_END)
+        entries = size // INDEX_DTYPE.itemsize
+        indexed_to = 0
+        # Drop index entries that point past the end of the log
+        while entries:
+            index.seek((entries - 1) * INDEX_DTYPE.itemsize)
+            last = np.frombuffer(index.read(INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)[0]
+            if last["offset"] + last["length"] <= log_size:
+                indexed_to = int(last["offset"] + last["length"])
+                break
+            entries -= 1
+        if entries * INDEX_DTYPE.itemsize != size:
+            index.truncate(entries * INDEX_DTYPE.itemsize)
+            fixes.append(f"trimmed the index to {entries} entries")
+
+        # Index complete log lines that never made it into the index;
+        # lines that are not a whole game record are skipped
+        added = skipped = 0
+        with open(log_path, "rb") as log:
+            log.seek(indexed_to)
+            offset = indexed_to
+            for line in log:
+                try:
+                    entry = _index_entry(offset, len(line), json.loads(line))
+                except (ValueError, KeyError, TypeError, OverflowError):
+                    skipped += 1
+                else:
+                    index.write(entry)
+                    added += 1
+                offset += len(line)
+        if added:
+            fixes.append(f"re-indexed {added} games")
+        if skipped:
+            fixes.append(f"skipped {skipped} unreadable log lines")
+
+    return "; ".join(fixes) or None
+
+
+# --- WRITER ---
+class HistoryStore:
+    """Appends finished games to disk from a background writer thread."""
+
+    def __init__(self, directory=HISTORY_DIR, fsync_interval=FSYNC_INTERVAL):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.session = int(time.time())
+        fixed = recover(directory)
+        if fixed:
+            print("🗂 History recovered:", fixed)
+        self.games_written = 0
+        self.fsyncs = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, game):
+        """Queue a finished game (a dict, see GameRecorder) for writing."""
+        game.setdefault("session", self.session)
+        self._queue.put(game)
+
+    def _run(self):
+        log = open(os.path.join(self.directory, LOG_NAME), "ab")
+        index = open(os.path.join(self.directory, INDEX_NAME), "ab")
+        last_sync = time.monotonic()
+        pending = False
+        running = True
+        while running:
+            timeout = self.fsync_interval if pending else None
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while True:  # take everything already queued
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = batch[:batch.index(None)]
+
+            if batch:
+                offset = log.tell()
+                lines, entries = [], []
+                for game in batch:
+                    replayed = replay(game["events"]).score
+                    if replayed != game["score"]:
+                        print(f"⚠️ Recorded game replays to {replayed}, not {game['score']}")
+                    line = (json.dumps(game, separators=(",", ":")) + "\n").encode()
+                    lines.append(line)
+                    entries.append(_index_entry(offset, len(line), game))
+                    offset += len(line)
+                log.write(b"".join(lines))
+                log.flush()
+                index.write(b"".join(entries))
+                index.flush()
+                self.games_written += len(batch)
+                pending = True
+
+            now = time.monotonic()
+            if pending and (not running or now - last_sync >= self.fsync_interval):
+                os.fsync(log.fileno())
+                os.fsync(index.fileno())
+                self.fsyncs += 1
+                last_sync = now
+                pending = False
+        log.close()
+        index.close()
+
+    def close(self):
+        """Write and sync everything still queued, then stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+class GameRecorder:
+    """Collects one game's events and submits it when the game ends.
+
+    A game ends when the last ball drains or when it is reset with anything
+    on the board. Events after the last ball, up to the next reset, are not
+    recorded.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._start()
+
+    def _start(self):
+        self.events = []
+        self.final = None
+        self.over = False
+
+    def record(self, event, state):
+        """Call after the rules applied `event`, with the resulting state."""
+        kind, t = event
+        if kind == RESET:
+            if not self.over and self.final and self.final[0]:
+                self._finish()
+            self._start()
+            return
+        if self.over:
+            return
+        self.events.append((kind, t))
+        self.final = state.as_tuple()
+        if state.balls_left <= 0:
+            self._finish()
+            self.over = True
+
+    def _finish(self):
+        score, balls_left, collected, jackpot = self.final
+        duration = self.events[-1][1] - self.events[0][1]
+        # Times are kept as recorded: rounding them can move a hit across
+        # its cooldown boundary and change the replayed score. The writer
+        # thread checks the replay, off the frame loop.
+        self.store.submit({
+            "ended": time.time(),
+            "duration": round(duration, 3),
+            "score": score,
+            "balls_left": balls_left,
+            "collected": collected,
+            "jackpot": jackpot,
+            "hits": sum(1 for kind, _ in self.events if kind in HIT_KINDS),
+            "events": [[kind, t] for kind, t in self.events],
+        })
+
+
+# --- READER ---
+class HistoryReader:
+    """Leaderboard and per-session queries over a memory-mapped index."""
+
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = directory
+        self._mm = None
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        path = os.path.join(directory, INDEX_NAME)
+        if os.path.exists(path) and os.path.getsize(path) >= INDEX_DTYPE.itemsize:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            count = len(self._mm) // INDEX_DTYPE.itemsize
+            self.index = np.frombuffer(self._mm, dtype=INDEX_DTYPE, count=count)
+
+    def __len__(self):
+        return len(self.index)
+
+    def top(self, n=10):
+        """The `n` best games, highest score first (earliest wins ties)."""
+        order = np.argsort(-self.index["score"], kind="stable")[:n]
+        return [self._summary(self.index[i]) for i in order]
+
+    def game(self, entry):
+        """Full record, events included, for an index entry or top() result."""
+        with open(os.path.join(self.directory, LOG_NAME), "rb") as log:
+            log.seek(int(entry["offset"]))
+            return json.loads(log.read(int(entry["length"])))
+
+    def sessions(self):
+        """Per-session aggregates, oldest session first."""
+        if not len(self.index):
+            return []
+        ids, which = np.unique(self.index["session"], return_inverse=True)
+        games = np.bincount(which)
+        total = np.bincount(which, weights=self.index["score"])
+        hits = np.bincount(which, weights=self.index["hits"])
+        jackpots = np.bincount(which, weights=self.index["jackpot"])
+        best = np.full(len(ids), np.iinfo(np.int64).min)
+        np.maximum.at(best, which, self.index["score"])
+        return [{"session": int(ids[i]), "games": int(games[i]), "best": int(best[i]),
+                 "mean": float(total[i] / games[i]), "hits": int(hits[i]),
+                 "jackpots": int(jackpots[i])} for i in range(len(ids))]
+
+    def _summary(self, entry):
+        return {"score": int(entry["score"]), "ended": float(entry["ended"]),
+                "session": int(entry["session"]), "hits": int(entry["hits"]),
+                "jackpot": bool(entry["jackpot"]), "offset": int(entry["offset"]),
+                "length": int(entry["length"])}
+
+    def close(self):
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        if self._mm:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,88 @@
+"""Event-driven switch input for the scoreboard.
+
+Switch closures are timestamped as they happen (from gpiozero's callback
+thread) and queued; the frame loop drains the queue once per frame, so
+nothing in the render loop has to poll or sleep.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+
+TARGET = "target"
+BUMPER1 = "bumper1"
+BUMPER2 = "bumper2"
+
+SwitchEvent = namedtuple("SwitchEvent", "source t")
+
+
+class InputQueue:
+    """Thread-safe queue of timestamped switch closures."""
+
+    def __init__(self, maxlen=1024):
+        self.maxlen = maxlen
+        self._events = deque()
+        self.pushed = 0
+        self.dropped = 0  # closures discarded because the queue was full
+        self.on_push = None  # called (from the pushing thread) after each event
+
+    def push(self, source, t=None):
+        """Record a closure of `source`; safe to call from any thread."""
+        if len(self._events) >= self.maxlen:
+            self.dropped += 1
+            return
+        self._events.append(SwitchEvent(source, time.monotonic() if t is None else t))
+        self.pushed += 1
+        if self.on_push:
+            self.on_push()
+
+    def attach(self, button, source):
+        """Queue an event every time `button` is pressed."""
+        button.when_pressed = lambda: self.push(source)
+
+    def drain(self):
+        """Return every queued event, oldest first."""
+        events = []
+        try:
+            while True:
+                events.append(self._events.popleft())
+        except IndexError:
+            return events
+
+    def __len__(self):
+        return len(self._events)
+
+
+class SimulatedButton:
+    """Stand-in for gpiozero.Button on machines without GPIO.
+
+    `press()` fires `when_pressed` just like a real switch closure, and
+    `burst()` replays a run of presses at a fixed rate from a background
+    thread for latency / dropped-hit testing.
+    """
+
+    def __init__(self):
+        self.when_pressed = None
+        self.presses = 0
+
+    @property
+    def is_pressed(self): return False
+
+    def press(self):
+        self.presses += 1
+        if self.when_pressed:
+            self.when_pressed()
+
+    def burst(self, rate, count):
+        """Press `count` times at `rate` presses per second (non-blocking)."""
+        def run():
+            start = time.monotonic()
+            for i in range(count):
+                delay = start + i / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                self.press()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self): pass
@@ -0,0 +1,67 @@
+"""Adaptive frame pacing for the scoreboard.
+
+While anything is happening (inputs, score changes, repainted regions) the
+loop runs at full rate. Once the screen has been still for `linger`
+seconds the pacer stops ticking at 60 fps and instead blocks in
+pygame.event.wait() until an event arrives or the idle timeout passes.
+Switch callbacks post a wake event so a hit ends the idle wait at once.
+The event that ended the wait is handed back by events(), ahead of the
+rest of the queue, so event order is preserved.
+"""
+import time
+
+import pygame
+
+FPS = 60
+IDLE_FPS = 2     # frames per second when nothing is changing
+LINGER = 1.0     # seconds of full rate after the last activity
+
+
+class FramePacer:
+    def __init__(self, fps=FPS, idle_fps=IDLE_FPS, linger=LINGER):
+        self.fps = fps
+        self.idle_timeout = int(1000 / idle_fps)
+        self.linger = linger
+        self.clock = pygame.time.Clock()
+        self.idle = False
+        self.pending = []   # event that ended an idle wait, not yet handled
+        self.last_activity = time.monotonic()
+        # mode -> [wall seconds, cpu seconds]
+        self.usage = {"active": [0.0, 0.0], "idle": [0.0, 0.0]}
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+
+    def tick(self, busy):
+        """End the frame; `busy` says whether this frame changed anything."""
+        now = time.monotonic()
+        if busy:
+            self.last_activity = now
+        self.idle = now - self.last_activity >= self.linger
+        if self.idle:
+            event = pygame.event.wait(self.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                self.pending.append(event)  # leave it for the next frame
+        else:
+            self.clock.tick(self.fps)
+        self._account("idle" if self.idle else "active")
+
+    def events(self):
+        """This frame's pygame events; use instead of pygame.event.get()."""
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        return events
+
+    def _account(self, mode):
+        wall, cpu = time.monotonic(), time.process_time()
+        usage = self.usage[mode]
+        usage[0] += wall - self._wall
+        usage[1] += cpu - self._cpu
+        self._wall, self._cpu = wall, cpu
+
+    def report(self):
+        """CPU seconds used per minute of wall time in each mode."""
+        lines = []
+        for mode, (wall, cpu) in self.usage.items():
+            per_min = cpu / wall * 60 if wall else 0.0
+            lines.append("%-6s %6.1fs wall %5.1fs cpu/min" % (mode, wall, per_min))
+        return lines
@@ -0,0 +1,79 @@
+"""Per-phase frame timing for the scoreboard's debug overlay.
+
+The frame loop calls begin_frame(), then mark(phase) after each stage and
+end_frame() at the bottom. Each mark records the time since the previous
+one into a fixed-size ring of recent frames. While disabled every call
+returns immediately, so the hooks can stay in production builds.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class FrameProfiler:
+    def __init__(self, phases, frames=600):
+        self.phases = tuple(phases)
+        self._column = {phase: i for i, phase in enumerate(self.phases)}
+        self.samples = np.zeros((frames, len(self.phases)))
+        self.count = 0        # frames recorded so far
+        self.enabled = False
+        self._row = None      # timings of the frame in progress
+        self._last = 0.0
+
+    def begin_frame(self):
+        if self.enabled:
+            self._row = [0.0] * len(self.phases)
+            self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the last mark to `phase`."""
+        if self.enabled and self._row is not None:
+            now = time.perf_counter()
+            self._row[self._column[phase]] += now - self._last
+            self._last = now
+
+    def end_frame(self):
+        if self._row is not None:
+            if self.enabled:
+                self.samples[self.count % len(self.samples)] = self._row
+                self.count += 1
+            self._row = None
+
+    def recent(self):
+        """Recorded frames, oldest first."""
+        size = len(self.samples)
+        if self.count <= size:
+            return self.samples[:self.count]
+        return np.roll(self.samples, -(self.count % size), axis=0)
+
+    def stats(self):
+        """{phase: (p50, p95, p99, worst)} in seconds, plus the whole frame."""
+        frames = self.recent()
+        if not len(frames):
+            return {}
+        frames = np.column_stack([frames, frames.sum(axis=1)])
+        pct = np.percentile(frames, [50, 95, 99], axis=0)
+        worst = frames.max(axis=0)
+        return {phase: (pct[0, i], pct[1, i], pct[2, i], worst[i])
+                for i, phase in enumerate(self.phases + ("frame",))}
+
+    def report(self):
+        """Text lines for the overlay, times in milliseconds."""
+        lines = ["%-10s %6s %6s %6s %6s" % ("phase", "p50", "p95", "p99", "worst")]
+        for phase, values in self.stats().items():
+            lines.append("%-10s %6.2f %6.2f %6.2f %6.2f" % ((phase,) + tuple(v * 1000 for v in values)))
+        return lines
+
+    def dump(self, path):
+        """Write recent frames (ms per phase) to `path` as .jsonl or CSV."""
+        frames = self.recent() * 1000
+        with open(path, "w", newline="") as f:
+            if path.endswith(".jsonl"):
+                for row in frames:
+                    f.write(json.dumps(dict(zip(self.phases, row.round(4).tolist()))) + "\n")
+            else:
+                writer = csv.writer(f)
+                writer.writerow(self.phases)
+                writer.writerows(row.round(4).tolist() for row in frames)
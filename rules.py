@@ -0,0 +1,134 @@
+"""Headless game rules for the scoreboard.
+
+Everything that changes the score lives here, with no pygame import, so
+recorded games can be replayed and checked without a display or mixer.
+Events are `(kind, t)` pairs -- the same shape as inputs.SwitchEvent --
+where `t` is a monotonic timestamp in seconds.
+
+    python rules.py game1.jsonl [game2.jsonl ...]   # replay recorded logs
+"""
+import json
+import sys
+
+from inputs import TARGET, BUMPER1, BUMPER2
+
+# Keyboard / rule events (switch events come from inputs.py)
+BONUS = "bonus"      # SPACE test key
+SPOT = "spot"        # T test key
+LETTER = "letter"    # light the next PIONEER letter
+DRAIN = "drain"      # ball lost
+RESET = "reset"
+JACKPOT = "jackpot"  # awarded by the rules, never sent in
+
+WORD = "PIONEER"
+BALLS = 2
+HIT_COOLDOWN = 0.4     # seconds between strike plate hits
+BUMPER_COOLDOWN = 0.3  # seconds between hits on the same bumper
+
+# kind: (points, cooldown in seconds, effect)
+SCORING = {
+    TARGET:  (500, HIT_COOLDOWN, None),
+    BUMPER1: (100, BUMPER_COOLDOWN, None),
+    BUMPER2: (100, BUMPER_COOLDOWN, None),
+    BONUS:   (1000, 0, None),
+    SPOT:    (450, 0, None),
+    LETTER:  (0, 0, LETTER),
+    DRAIN:   (0, 0, DRAIN),
+    RESET:   (0, 0, RESET),
+    JACKPOT: (10000, 0, None),
+}
+
+
+class GameState:
+    __slots__ = ("score", "balls_left", "collected", "mega_jackpot")
+
+    def __init__(self, score=0, balls_left=BALLS, collected=0, mega_jackpot=False):
+        self.score = score
+        self.balls_left = balls_left
+        self.collected = collected
+        self.mega_jackpot = mega_jackpot
+
+    def as_tuple(self):
+        return (self.score, self.balls_left, self.collected, self.mega_jackpot)
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return "GameState(score=%r, balls_left=%r, collected=%r, mega_jackpot=%r)" % self.as_tuple()
+
+
+class Game:
+    """Applies batches of events to a GameState using a scoring table."""
+
+    def __init__(self, scoring=SCORING, state=None):
+        self.scoring = scoring
+        self.state = state or GameState()
+        self.last_hit = {}  # kind -> timestamp of last accepted hit
+
+    def apply(self, events):
+        """Apply `(kind, t)` events in order; return the kinds that scored.
+
+        Events still inside their cooldown are ignored; RESET also clears the
+        cooldowns, so a game replays the same from a fresh Game. JACKPOT is
+        added to the result whenever the last PIONEER letter is lit.
+        """
+        scoring = self.scoring
+        last_hit = self.last_hit
+        state = self.state
+        score, balls_left = state.score, state.balls_left
+        collected, mega_jackpot = state.collected, state.mega_jackpot
+        jackpot_points = scoring[JACKPOT][0]
+        letters = len(WORD)
+        accepted = []
+
+        for kind, t in events:
+            points, cooldown, effect = scoring[kind]
+            if cooldown:
+                if t - last_hit.get(kind, float("-inf")) < cooldown:
+                    continue
+                last_hit[kind] = t
+            score += points
+            accepted.append(kind)
+            if effect is None:
+                continue
+            if effect == LETTER:
+                if collected < letters:
+                    collected += 1
+                if collected == letters:
+                    mega_jackpot = True
+                    score += jackpot_points
+                    accepted.append(JACKPOT)
+            elif effect == DRAIN:
+                balls_left -= 1
+            elif effect == RESET:
+                score, balls_left, collected, mega_jackpot = 0, BALLS, 0, False
+                last_hit.clear()
+
+        state.score, state.balls_left = score, balls_left
+        state.collected, state.mega_jackpot = collected, mega_jackpot
+        return accepted
+
+
+def replay(events, scoring=SCORING):
+    """Replay a recorded game from scratch and return its final state."""
+    game = Game(scoring)
+    game.apply(events)
+    return game.state
+
+
+def load_log(path):
+    """Read a JSONL event log: one `[kind, t]` pair per line."""
+    with open(path) as f:
+        return [(kind, t) for kind, t in map(json.loads, filter(str.strip, f))]
+
+
+def save_log(path, events):
+    with open(path, "w") as f:
+        for kind, t in events:
+            f.write(json.dumps([kind, t]) + "\n")
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(path, replay(load_log(path)))
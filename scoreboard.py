@@ -1,4 +1,16 @@
-import pygame, sys, time, threading
+import time
+STARTED = time.perf_counter()  # for the time-to-first-frame message
+import pygame, sys, os
+import assets
+from dotmatrix import DotMatrix
+from history import HistoryStore, HistoryReader, GameRecorder
+from compositor import Compositor
+from broadcast import StatePublisher
+from coils import CoilDriver
+from inputs import InputQueue, SimulatedButton, TARGET, BUMPER1, BUMPER2
+from pacing import FramePacer
+from profiler import FrameProfiler
+from rules import Game, BONUS, SPOT, LETTER, DRAIN, RESET, JACKPOT
 
 # --- GPIO SETUP (cross-platform safe) ---
 try:
@@ -25,62 +37,44 @@ except Exception as e:
     print(f"⚠️ GPIO not available ({e}). Using mock mode for testing.")
     USE_GPIO = False
 
-    class MockButton:
-        @property
-        def is_pressed(self): return False
-        def close(self): pass
-
     class MockGate:
         def on(self): pass
         def off(self): pass
         def close(self): pass
 
-    targets_any = MockButton()
-    bumper1 = MockButton()
-    bumper2 = MockButton()
+    # Simulated switches: call .press() or .burst(rate, count) to drive them
+    targets_any = SimulatedButton()
+    bumper1 = SimulatedButton()
+    bumper2 = SimulatedButton()
     gate1 = MockGate()
     gate2 = MockGate()
 
 # --- INITIALIZE PYGAME ---
-pygame.init()
+# Only what the first frame needs; the mixer starts on the sound thread.
+pygame.display.init()
+pygame.font.init()
 WIDTH, HEIGHT = 1000, 700
 SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("SHU PIONEER ARENA")
 
 # --- SOUND SETUP ---
-pygame.mixer.init()
-try:
-    hit_sound = pygame.mixer.Sound("assets/hit.wav")
-    bumper_sound = pygame.mixer.Sound("assets/bumper.wav")
-    jackpot_sound = pygame.mixer.Sound("assets/jackpot.wav")
-except Exception as e:
-    print("⚠️ Sound files missing or mixer error:", e)
-    hit_sound = bumper_sound = jackpot_sound = None
+# Sounds and looping background music load in the background; effects
+# requested before they are ready are skipped.
+sounds = assets.SoundBank({"hit": "assets/hit.wav",
+                           "bumper": "assets/bumper.wav",
+                           "jackpot": "assets/jackpot.wav"},
+                          music="assets/hockey_theme.mp3")
 
 def play_sound(name):
     """Play a sound effect by name."""
-    if name == "hit" and hit_sound: hit_sound.play()
-    elif name == "bumper" and bumper_sound: bumper_sound.play()
-    elif name == "jackpot" and jackpot_sound: jackpot_sound.play()
-
-# --- BACKGROUND MUSIC SETUP ---
-def start_music():
-    """Start looping hockey-themed background music."""
-    try:
-        pygame.mixer.music.load("assets/hockey_theme.mp3")
-        pygame.mixer.music.set_volume(0.4)
-        pygame.mixer.music.play(-1)  # -1 = infinite loop
-        print("🎵 Background hockey music playing.")
-    except Exception as e:
-        print("⚠️ Could not load background music:", e)
+    sounds.play(name)
 
 music_on = True  # for mute toggle
 
 # --- LOAD IMAGES ---
-rink_img = pygame.image.load("assets/icerink.png").convert()
-jumbo_img = pygame.image.load("assets/jumboT.png").convert_alpha()
-rink_img = pygame.transform.scale(rink_img, (WIDTH, HEIGHT))
-jumbo_img = pygame.transform.scale(jumbo_img, (800, 600))
+# Pre-scaled copies are cached under assets/.cache after the first run
+rink_img = assets.load_image("assets/icerink.png", (WIDTH, HEIGHT))
+jumbo_img = assets.load_image("assets/jumboT.png", (800, 600), alpha=True)
 
 jumbo_x = WIDTH // 2 - jumbo_img.get_width() // 2
 jumbo_y = 50
@@ -90,136 +84,177 @@ cutout_y = jumbo_y + 60
 cutout_rect = pygame.Rect(cutout_x, cutout_y, cutout_width, cutout_height)
 
 # --- FONTS ---
-small_font = pygame.font.SysFont("Courier New", 28, bold=True)
-medium_font = pygame.font.SysFont("Courier New", 48, bold=True)
+tiny_font = assets.font("Courier New", 14, bold=True)
+small_font = assets.font("Courier New", 28, bold=True)
+medium_font = assets.font("Courier New", 48, bold=True)
 
 # --- GAME STATE ---
-score = 0
-balls_left = 2
-collected = 0
-mega_jackpot = False
+game = Game()  # score, balls_left, collected, mega_jackpot live in game.state
 debug_mode = False
-clock = pygame.time.Clock()
+pacer = FramePacer()  # full rate while things change, sleeps when idle
 
 # --- DOT MATRIX RENDERER ---
-def draw_dot_text(surface, text, x, y, color=(255,255,255), scale=2, spacing=3):
-    font = pygame.font.SysFont("Courier New", 48, bold=True)
-    base = font.render(text, True, (255,255,255))
-    base = pygame.transform.scale(base, (base.get_width()*scale, base.get_height()*scale))
-    mask = pygame.mask.from_surface(base)
-    for px in range(mask.get_size()[0]):
-        for py in range(mask.get_size()[1]):
-            if mask.get_at((px, py)) and (px % spacing == 0) and (py % spacing == 0):
-                pygame.draw.circle(surface, color, (x + px, y + py), 2)
-
-# --- PIONEER BULBS ---
-def draw_pioneer(surface, x, y, collected):
-    word = "PIONEER"
-    for i, letter in enumerate(word):
-        if i < collected:
-            draw_dot_text(surface, letter, x + i * 70, y, (255,215,60), scale=2)
-        else:
-            draw_dot_text(surface, "•", x + i * 70, y, (120,120,60), scale=2)
+dot_matrix = DotMatrix(medium_font)  # glyph dot patterns are cached after first draw
 
-# --- DRAW EVERYTHING ---
-def draw_layout():
-    SCREEN.blit(rink_img, (0, 0))
-    SCREEN.blit(jumbo_img, (jumbo_x, jumbo_y))
-    # Score
+# --- SCREEN WIDGETS ---
+# Each widget renders onto its own layer; the compositor only repaints
+# the ones whose state changed since the last frame.
+def score_layer(score):
     score_text = str(score)
-    font = pygame.font.SysFont("Courier New", 48, bold=True)
-    base = font.render(score_text, True, (255,255,255))
-    base = pygame.transform.scale(base, (base.get_width()*3, base.get_height()*3))
-    mask = pygame.mask.from_surface(base)
-    text_width = mask.get_size()[0]
-    draw_dot_text(SCREEN, score_text,
-                  cutout_rect.centerx - text_width // 2,
-                  cutout_rect.y + 200,
-                  (255,255,255), scale=3)
-    # Pioneer letters
-    draw_pioneer(SCREEN,
-                 cutout_rect.x,
-                 cutout_rect.y + cutout_rect.height + 258,
-                 collected)
-    # Balls left
-    SCREEN.blit(small_font.render(f"Balls: {balls_left}", True, (255,255,255)),
-                (40, HEIGHT - 60))
-    # Jackpot
-    if mega_jackpot:
-        mj = medium_font.render("MEGA JACKPOT!!", True, (206,17,65))
-        SCREEN.blit(mj, (WIDTH // 2 - mj.get_width() // 2, HEIGHT - 80))
-    # Debug overlay
-    if debug_mode:
-        pygame.draw.rect(SCREEN, (255,0,0), cutout_rect, 2)
-        step_x = cutout_rect.width // 10
-        step_y = cutout_rect.height // 5
-        for gx in range(cutout_rect.x, cutout_rect.right, step_x):
-            pygame.draw.line(SCREEN, (255,0,0), (gx, cutout_rect.y), (gx, cutout_rect.bottom), 1)
-        for gy in range(cutout_rect.y, cutout_rect.bottom, step_y):
-            pygame.draw.line(SCREEN, (255,0,0), (cutout_rect.x, gy), (cutout_rect.right, gy), 1)
-
-# --- STRIKE PLATE HANDLER ---
-last_hit = 0
-HIT_COOLDOWN = 0.4  # seconds
-
-def on_target_hit():
-    global last_hit, score
-    now = time.time()
-    if now - last_hit >= HIT_COOLDOWN:
-        score += 500
-        last_hit = now
-        print("🎯 Target hit! +500")
-        play_sound("hit")
+    text_width = dot_matrix.text_width(score_text, scale=3)
+    layer = dot_matrix.render(score_text, (255,255,255), scale=3)
+    return layer, (cutout_rect.centerx - text_width // 2 - dot_matrix.pad,
+                   cutout_rect.y + 200 - dot_matrix.pad)
+
+def pioneer_layer(collected):
+    return dot_matrix.render_bulbs("PIONEER", collected), (
+        cutout_rect.x - dot_matrix.pad,
+        cutout_rect.y + cutout_rect.height + 258 - dot_matrix.pad)
+
+def balls_layer(balls_left):
+    return small_font.render(f"Balls: {balls_left}", True, (255,255,255)), (40, HEIGHT - 60)
+
+def jackpot_layer(mega_jackpot):
+    if not mega_jackpot:
+        return None, None
+    mj = medium_font.render("MEGA JACKPOT!!", True, (206,17,65))
+    return mj, (WIDTH // 2 - mj.get_width() // 2, HEIGHT - 80)
+
+def debug_layer(debug_mode):
+    if not debug_mode:
+        return None, None
+    # +1 because the grid lines run up to and including the bottom/right edge
+    layer = pygame.Surface((cutout_rect.width + 1, cutout_rect.height + 1), pygame.SRCALPHA)
+    grid = cutout_rect.move(-cutout_rect.x, -cutout_rect.y)
+    pygame.draw.rect(layer, (255,0,0), grid, 2)
+    step_x = grid.width // 10
+    step_y = grid.height // 5
+    for gx in range(grid.x, grid.right, step_x):
+        pygame.draw.line(layer, (255,0,0), (gx, grid.y), (gx, grid.bottom), 1)
+    for gy in range(grid.y, grid.bottom, step_y):
+        pygame.draw.line(layer, (255,0,0), (grid.x, gy), (grid.right, gy), 1)
+    return layer, cutout_rect.topleft
+
+def profile_layer(state):
+    if not state:
+        return None, None
+    lines = [tiny_font.render(line, True, (255,255,0)) for line in profiler.report() + pacer.report()]
+    line_height = tiny_font.get_linesize()
+    layer = pygame.Surface((max(l.get_width() for l in lines) + 12,
+                            line_height * len(lines) + 12), pygame.SRCALPHA)
+    layer.fill((0,0,0,170))
+    for i, line in enumerate(lines):
+        layer.blit(line, (6, 6 + i * line_height))
+    return layer, (10, 10)
 
-# --- BUMPER HANDLERS ---
-last_bumper_hit = {1: 0, 2: 0}
-BUMPER_COOLDOWN = 0.3
+# --- DRAW EVERYTHING ---
+background = rink_img.copy()  # rink + jumbotron never change, so flatten them once
+background.blit(jumbo_img, (jumbo_x, jumbo_y))
+
+compositor = Compositor(SCREEN, background)
+compositor.add("score", lambda: game.state.score, score_layer)
+compositor.add("pioneer", lambda: game.state.collected, pioneer_layer)
+compositor.add("balls", lambda: game.state.balls_left, balls_layer)
+compositor.add("jackpot", lambda: game.state.mega_jackpot, jackpot_layer)
+compositor.add("debug", lambda: debug_mode, debug_layer)
+# Refresh the timing table every 30 recorded frames while debug is on
+compositor.add("profile", lambda: debug_mode and (profiler.count // 30,), profile_layer)
+
+# --- FRAME PROFILER ---
+# Times each stage of the frame while debug mode is on; set PINBALL_PROFILE
+# to a .csv or .jsonl path to always record and dump recent frames on exit.
+PROFILE_DUMP = os.environ.get("PINBALL_PROFILE")
+profiler = FrameProfiler(("events", "rules")
+                         + tuple(w.name for w in compositor.widgets)
+                         + ("composite", "display", "tick"))
+profiler.enabled = bool(PROFILE_DUMP)
+compositor.profiler = profiler
+
+def draw_layout():
+    """Repaint whatever changed and return the dirty rects for display.update."""
+    return compositor.update()
+
+# --- SWITCH INPUTS ---
+# Switch closures are queued with their own timestamps by gpiozero's
+# callback thread and handled once per frame, so the loop never sleeps.
+switch_events = InputQueue()
+switch_events.attach(targets_any, TARGET)
+switch_events.attach(bumper1, BUMPER1)
+switch_events.attach(bumper2, BUMPER2)
+# Wake the frame loop if it is sleeping in idle mode
+WAKE = pygame.event.custom_type()
+switch_events.on_push = lambda: pygame.event.post(pygame.event.Event(WAKE))
+
+# --- TEST KEYS ---
+KEY_EVENTS = {
+    pygame.K_SPACE: BONUS,
+    pygame.K_t: SPOT,
+    pygame.K_g: LETTER,
+    pygame.K_b: DRAIN,
+    pygame.K_r: RESET,
+    pygame.K_RETURN: TARGET,  # simulated strike plate
+}
+
+# --- BUMPER COILS ---
 PULSE_TIME = 0.1
 
-def on_bumper_hit(bumper_id):
-    global last_bumper_hit, score
-    now = time.time()
-    if now - last_bumper_hit[bumper_id] >= BUMPER_COOLDOWN:
-        score += 100
-        last_bumper_hit[bumper_id] = now
+# One driver thread owns both coil gates; repeat fires while a coil is
+# still pulsing are merged.
+coils = CoilDriver()
+coils.add(1, gate1, pulse=PULSE_TIME)
+coils.add(2, gate2, pulse=PULSE_TIME)
+
+# --- SCORING FEEDBACK ---
+def on_scored(kind):
+    """Sounds, messages and coils for an event the rules accepted."""
+    if kind == TARGET:
+        print("🎯 Target hit! +500")
+        play_sound("hit")
+    elif kind in (BUMPER1, BUMPER2):
+        bumper_id = 1 if kind == BUMPER1 else 2
         print(f" Bumper {bumper_id} hit! +100")
         play_sound("bumper")
-        gate = gate1 if bumper_id == 1 else gate2
-        threading.Thread(target=pulse_solenoid, args=(gate,), daemon=True).start()
-
-def pulse_solenoid(gate):
-    gate.on()
-    time.sleep(PULSE_TIME)
-    gate.off()
-
-# --- START MUSIC BEFORE MAIN LOOP ---
-start_music()
+        coils.fire(bumper_id)
+    elif kind == JACKPOT:
+        play_sound("jackpot")
+
+# --- GAME HISTORY ---
+# Finished games are written by a background thread under history/
+history = HistoryStore()
+recorder = GameRecorder(history)
+leaderboard = HistoryReader()
+if len(leaderboard):
+    print("🏆 High scores:", ", ".join(str(g["score"]) for g in leaderboard.top(5)))
+leaderboard.close()
+
+# --- STATE BROADCAST ---
+# Mirrors score, balls and PIONEER progress to other screens (see
+# broadcast.py). PINBALL_BROADCAST=group:port to change, "off" to disable.
+BROADCAST = os.environ.get("PINBALL_BROADCAST", "239.255.42.99:5005")
+publisher = None
+if BROADCAST != "off":
+    group, port = BROADCAST.rsplit(":", 1)
+    publisher = StatePublisher(group, int(port))
 
 # --- MAIN LOOP ---
 running = True
 while running:
-    for e in pygame.event.get():
+    profiler.begin_frame()
+    # Switch hits queued since the last frame, then this frame's test keys
+    events = switch_events.drain()
+    frame_events = pacer.events()
+    for e in frame_events:
         if e.type == pygame.QUIT:
             running = False
+        if e.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+            compositor.invalidate()  # uncovered/restored: the whole window is stale
         if e.type == pygame.KEYDOWN:
-            if e.key == pygame.K_SPACE:
-                score += 1000
-            elif e.key == pygame.K_t:
-                score += 450
-            elif e.key == pygame.K_g:
-                if collected < len("PIONEER"):
-                    collected += 1
-                if collected == len("PIONEER"):
-                    mega_jackpot = True
-                    score += 10000
-                    play_sound("jackpot")
-            elif e.key == pygame.K_b:
-                balls_left -= 1
-            elif e.key == pygame.K_r:
-                score, balls_left, collected, mega_jackpot = 0, 2, 0, False
+            if e.key in KEY_EVENTS:
+                events.append((KEY_EVENTS[e.key], time.monotonic()))
             elif e.key == pygame.K_d:
                 debug_mode = not debug_mode
-            elif e.key == pygame.K_m:
+                profiler.enabled = debug_mode or bool(PROFILE_DUMP)
+            elif e.key == pygame.K_m and sounds.available:
                 music_on = not music_on
                 if music_on:
                     pygame.mixer.music.unpause()
@@ -228,31 +263,35 @@ while running:
                     pygame.mixer.music.pause()
                     print("🔇 Music OFF")
 
-    # --- Physical targets ---
-    if USE_GPIO:
-        # Strike plates
-        if targets_any.is_pressed:
-            on_target_hit()
-            time.sleep(0.25)
-        # Bumpers
-        if bumper1.is_pressed:
-            on_bumper_hit(1)
-            time.sleep(0.1)
-        if bumper2.is_pressed:
-            on_bumper_hit(2)
-            time.sleep(0.1)
-
-    # --- Simulated test key (ENTER) ---
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_RETURN]:
-        on_target_hit()
-        pygame.time.wait(200)
-
-    draw_layout()
-    pygame.display.flip()
-    clock.tick(60)
+    profiler.mark("events")
+
+    for event in events:
+        for kind in game.apply((event,)):
+            on_scored(kind)
+        recorder.record(event, game.state)
+    if publisher:
+        publisher.publish(game.state)
+    profiler.mark("rules")
+
+    dirty = draw_layout()
+    profiler.mark("composite")
+    pygame.display.update(dirty)
+    profiler.mark("display")
+    if STARTED:
+        print(f"🖥 First frame after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+        STARTED = None
+    pacer.tick(busy=bool(events or frame_events or dirty))
+    profiler.mark("tick")
+    profiler.end_frame()
 
 # --- CLEAN EXIT ---
+history.close()
+if publisher:
+    publisher.close()
+print("⏱ CPU use:", " | ".join(pacer.report()))
+if PROFILE_DUMP:
+    profiler.dump(PROFILE_DUMP)
+coils.close()
 targets_any.close()
 bumper1.close()
 bumper2.close()